@@ -21,7 +21,9 @@ def get_random_image_path(instance, filename, upload_to_dir):
 
 def process_and_save_image(image_field, size=(300, 300), crop_to_square=True, quality=70):
     """
-    Processa uma imagem e a salva de volta no campo.
+    Processa uma imagem recém-enviada e a salva de volta no campo.
+
+    Imagens que já estão gravadas no storage são ignoradas.
 
     Args:
         image_field: O campo ImageField da instância do modelo.
@@ -30,10 +32,15 @@ def process_and_save_image(image_field, size=(300, 300), crop_to_square=True, qu
                                Se False, redimensiona mantendo a proporção original.
         quality (int): A qualidade do JPEG a ser salvo (0-100).
     """
-    if not image_field:
+    # Arquivos já gravados no storage (`_committed`) foram processados no
+    # envio; salvar o modelo novamente não deve recodificar a imagem.
+    if not image_field or image_field._committed:
         return
 
     img = Image.open(image_field)
+    # Para JPEGs, decodifica já em escala reduzida (sem ficar abaixo de
+    # `size`), evitando descompactar a foto inteira em resolução máxima.
+    img.draft('RGB', size)
 
     # Converte para RGB para garantir compatibilidade e remover transparência
     if img.mode != 'RGB':
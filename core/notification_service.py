@@ -4,15 +4,18 @@ from .models import Notificacao
 def criar_notificacao_para_responsaveis(sala, mensagem):
     """
     Cria uma notificação para todos os zeladores responsáveis por uma sala.
+
+    As notificações são inseridas em lote, com um único INSERT, e os
+    responsáveis já pré-carregados na sala (`prefetch_related`) são
+    reaproveitados sem uma nova consulta.
     """
-    responsaveis = sala.responsaveis.all()
-    if not responsaveis.exists():
+    responsaveis = list(sala.responsaveis.all())
+    if not responsaveis:
         # Se a sala não tem responsáveis, notifica todos os membros do grupo Zeladoria
         responsaveis = User.objects.filter(groups__name='Zeladoria')
 
-    for usuario in responsaveis:
-        Notificacao.objects.create(
-            destinatario=usuario,
-            mensagem=mensagem,
-            link=f"/salas/{sala.qr_code_id}/"
-        )
+    link = f"/salas/{sala.qr_code_id}/"
+    Notificacao.objects.bulk_create([
+        Notificacao(destinatario=usuario, mensagem=mensagem, link=link)
+        for usuario in responsaveis
+    ])
@@ -0,0 +1,61 @@
+import functools
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from rest_framework.pagination import PageNumberPagination
+
+
+class CountedPaginator(Paginator):
+    """`Paginator` que aceita o total de itens já conhecido, sem `COUNT(*)`."""
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Paginação por número de página, opcional e com o total em cache.
+
+    A paginação só é aplicada quando o cliente informa `page_size`; sem esse
+    parâmetro a resposta continua sendo a lista completa, como antes.
+
+    O total de itens (`count`) é guardado em cache por usuário e por conjunto
+    de filtros, de modo que navegar pelas páginas seguintes não repete o
+    `COUNT(*)`. A primeira página sempre recalcula o total.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_cache_timeout = 300
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.get_page_size(request):
+            return None
+
+        count = self.get_cached_count(queryset, request)
+        self.django_paginator_class = functools.partial(CountedPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_cached_count(self, queryset, request):
+        """Retorna o total de itens do queryset, reaproveitando o valor em cache."""
+        cache_key = self.get_count_cache_key(request)
+        page_number = request.query_params.get(self.page_query_param, '1')
+
+        if page_number != '1':
+            count = cache.get(cache_key)
+            if count is not None:
+                return count
+
+        count = queryset.count()
+        cache.set(cache_key, count, self.count_cache_timeout)
+        return count
+
+    def get_count_cache_key(self, request):
+        """Monta a chave do total a partir do usuário, da rota e dos filtros."""
+        params = request.query_params.copy()
+        params.pop(self.page_query_param, None)
+        params.pop(self.page_size_query_param, None)
+        raw_key = f'{request.user.pk}:{request.path}?{params.urlencode()}'
+        return 'pagination_count:' + hashlib.sha256(raw_key.encode()).hexdigest()
@@ -0,0 +1,26 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renderizador JSON baseado em `orjson`, substituto direto do `JSONRenderer`
+    do DRF.
+
+    Os serializadores já entregam datas formatadas como texto, então a saída
+    é a mesma do renderizador padrão. Tipos que o `orjson` não conhece
+    (Decimal, textos traduzíveis, etc.) são convertidos pelo mesmo codificador
+    usado pelo DRF.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    _default = staticmethod(JSONEncoder().default)
+    _options = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._default, option=self._options)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Notificacao
 
+
 class RelativeImageField(serializers.ImageField):
     """
     Um campo de imagem customizado que serializa a imagem para sua URL relativa,
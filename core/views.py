@@ -5,6 +5,22 @@ from rest_framework.permissions import IsAuthenticated
 from .models import Notificacao
 from .serializers import NotificacaoSerializer
 
+
+class SkipEmptyFiltersMixin:
+    """
+    Ignora os `filter_backends` quando a requisição não traz parâmetros de
+    consulta.
+
+    Sem parâmetros nenhum filtro seria aplicado, então o resultado é o mesmo;
+    apenas deixa de ser construído o `FilterSet` do django-filter, que tem
+    custo próprio em toda listagem.
+    """
+    def filter_queryset(self, queryset):
+        if not self.request.query_params:
+            return queryset
+        return super().filter_queryset(queryset)
+
+
 class NotificacaoViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para listar e gerenciar notificações do usuário logado.
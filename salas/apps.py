@@ -6,4 +6,6 @@ class SalasConfig(AppConfig):
 
     def ready(self):
         """Importa os sinais da aplicação quando o Django está pronto."""
-        import salas.signals
\ No newline at end of file
+        from django.db.models.signals import post_migrate
+        import salas.signals
+        post_migrate.connect(salas.signals.gerar_pdf_inicial, sender=self)
\ No newline at end of file
@@ -1,11 +1,6 @@
 import django_filters
-from datetime import timedelta
 from django.contrib.auth.models import User
-from django.db.models import (
-    Q, F, Exists, OuterRef, Subquery, ExpressionWrapper, DateTimeField, DurationField
-)
-from django.utils import timezone
-from .models import Sala, LimpezaRegistro, RelatorioSalaSuja
+from .models import Sala, LimpezaRegistro
 
 
 class SalaFilter(django_filters.FilterSet):
@@ -56,73 +51,12 @@ class SalaFilter(django_filters.FilterSet):
     def filter_status_limpeza(self, queryset, name, value):
         """
         Filtra o queryset de Salas com base no status de limpeza calculado.
-        """
-        now = timezone.now()
-
-        ultima_limpeza_subquery = LimpezaRegistro.objects.filter(
-            sala=OuterRef('pk'), data_hora_fim__isnull=False
-        ).order_by('-data_hora_fim').values('data_hora_fim')[:1]
-
-        ultimo_relatorio_subquery = RelatorioSalaSuja.objects.filter(
-            sala=OuterRef('pk')
-        ).order_by('-data_hora').values('data_hora')[:1]
-
-        limpeza_em_andamento_subquery = LimpezaRegistro.objects.filter(
-            sala=OuterRef('pk'), data_hora_fim__isnull=True
-        )
-
-        annotated_queryset = queryset.annotate(
-            ultima_limpeza_fim=Subquery(ultima_limpeza_subquery),
-            ultimo_relatorio_data=Subquery(ultimo_relatorio_subquery),
-            tem_limpeza_em_andamento=Exists(limpeza_em_andamento_subquery)
-        )
-
-        duration_expr = ExpressionWrapper(
-            F('validade_limpeza_horas') * timedelta(hours=1),
-            output_field=DurationField()
-        )
-        cleaning_expires_at_expr = ExpressionWrapper(
-            F('ultima_limpeza_fim') + duration_expr,
-            output_field=DateTimeField()
-        )
 
-        if value == 'Em Limpeza':
-            return annotated_queryset.filter(tem_limpeza_em_andamento=True)
-
-        elif value == 'Suja':
-            condition_suja = Q(ultimo_relatorio_data__isnull=False) & \
-                             (Q(ultima_limpeza_fim__isnull=True) | Q(ultimo_relatorio_data__gt=F('ultima_limpeza_fim')))
-            return annotated_queryset.filter(
-                condition_suja,
-                tem_limpeza_em_andamento=False
-            )
-
-        elif value == 'Limpa':
-            annotated_queryset_for_limpa = annotated_queryset.annotate(
-                cleaning_expires_at=cleaning_expires_at_expr
-            )
-            condition_nao_suja = (Q(ultimo_relatorio_data__isnull=True) | Q(ultimo_relatorio_data__lt=F('ultima_limpeza_fim')))
-            return annotated_queryset_for_limpa.filter(
-                condition_nao_suja,
-                tem_limpeza_em_andamento=False,
-                ultima_limpeza_fim__isnull=False,
-                cleaning_expires_at__gte=now
-            )
-
-        elif value == 'Limpeza Pendente':
-            annotated_queryset_for_pendente = annotated_queryset.annotate(
-                cleaning_expires_at=cleaning_expires_at_expr
-            )
-            validade_expirada_condition = Q(cleaning_expires_at__lt=now)
-            nunca_limpa_ou_expirou_condition = Q(ultima_limpeza_fim__isnull=True) | validade_expirada_condition
-            condition_nao_suja = (Q(ultimo_relatorio_data__isnull=True) | Q(ultimo_relatorio_data__lt=F('ultima_limpeza_fim')))
-            return annotated_queryset_for_pendente.filter(
-                condition_nao_suja,
-                nunca_limpa_ou_expirou_condition,
-                tem_limpeza_em_andamento=False
-            )
-
-        return queryset
+        O status é a anotação `status_limpeza_anotado`, calculada no banco por
+        `SalaViewSet.get_queryset`. Assim, o filtro vira um predicado SQL e usa
+        exatamente a mesma regra do campo `status_limpeza` da resposta.
+        """
+        return queryset.filter(status_limpeza_anotado=value)
 
 
 class LimpezaRegistroFilter(django_filters.FilterSet):
@@ -1,6 +1,10 @@
+from datetime import timedelta
 from django.core.management.base import BaseCommand
+from django.db.models import (
+    Q, F, OuterRef, Subquery, ExpressionWrapper, DateTimeField, DurationField
+)
 from django.utils import timezone
-from salas.models import Sala
+from salas.models import Sala, LimpezaRegistro, RelatorioSalaSuja
 from core.notification_service import criar_notificacao_para_responsaveis
 
 
@@ -14,39 +18,54 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write(self.style.NOTICE('Iniciando verificação de limpezas pendentes...'))
 
-        # Filtra apenas salas ativas que possuem pelo menos uma limpeza concluída
-        salas_ativas = Sala.objects.filter(ativa=True, registros_limpeza__data_hora_fim__isnull=False).distinct()
+        agora = timezone.now()
 
-        salas_notificadas = 0
-        for sala in salas_ativas:
-            # Pega o último registro de limpeza CONCLUÍDO
-            ultimo_registro = sala.registros_limpeza.filter(data_hora_fim__isnull=False).latest('data_hora_fim')
+        # A última limpeza concluída e o último relatório de sujeira de cada sala
+        # são anotados na mesma consulta, evitando duas consultas por sala.
+        ultima_limpeza_fim = LimpezaRegistro.objects.filter(
+            sala=OuterRef('pk'), data_hora_fim__isnull=False
+        ).order_by('-data_hora_fim').values('data_hora_fim')[:1]
 
-            # Pega o último relatório de sujeira, se houver
-            ultimo_relatorio_suja = sala.relatorios_suja.first()
+        ultimo_relatorio_suja_data = RelatorioSalaSuja.objects.filter(
+            sala=OuterRef('pk')
+        ).order_by('-data_hora').values('data_hora')[:1]
 
-            # Se a sala foi marcada como suja após a última limpeza, não faz nada aqui.
-            # A notificação de "suja" já foi enviada pelo sinal.
-            if ultimo_relatorio_suja and ultimo_relatorio_suja.data_hora > ultimo_registro.data_hora_fim:
-                continue
+        duration_expr = ExpressionWrapper(
+            F('validade_limpeza_segundos') * timedelta(seconds=1),
+            output_field=DurationField()
+        )
+        limpeza_expira_em_expr = ExpressionWrapper(
+            F('ultima_limpeza_fim') + duration_expr,
+            output_field=DateTimeField()
+        )
 
-            # Calcula se o tempo de validade da limpeza expirou
-            validade_em_segundos = sala.validade_limpeza_horas * 3600
-            tempo_decorrido = (timezone.now() - ultimo_registro.data_hora_fim).total_seconds()
+        # Toda a decisão é feita no banco: apenas salas ativas, com limpeza
+        # concluída e expirada, que não foram reportadas como sujas depois
+        # dela (a notificação de "suja" já foi enviada pelo sinal) e que
+        # ainda não foram notificadas desde a última limpeza.
+        salas_pendentes = Sala.objects.filter(ativa=True).annotate(
+            ultima_limpeza_fim=Subquery(ultima_limpeza_fim),
+            ultimo_relatorio_suja_data=Subquery(ultimo_relatorio_suja_data),
+        ).annotate(
+            limpeza_expira_em=limpeza_expira_em_expr
+        ).filter(
+            Q(ultimo_relatorio_suja_data__isnull=True) |
+            Q(ultimo_relatorio_suja_data__lte=F('ultima_limpeza_fim')),
+            Q(data_notificacao_pendencia__isnull=True) |
+            Q(data_notificacao_pendencia__lt=F('ultima_limpeza_fim')),
+            ultima_limpeza_fim__isnull=False,
+            limpeza_expira_em__lte=agora,
+        ).prefetch_related('responsaveis')
 
-            if tempo_decorrido >= validade_em_segundos:
-                if sala.data_notificacao_pendencia and sala.data_notificacao_pendencia >= ultimo_registro.data_hora_fim:
-                    continue  # Já notificado, pular para a próxima sala
+        salas_notificadas = []
+        for sala in salas_pendentes:
+            mensagem = f"A limpeza da sala '{sala.nome_numero}' expirou e está pendente."
+            criar_notificacao_para_responsaveis(sala, mensagem)
+            salas_notificadas.append(sala.pk)
 
-                mensagem = f"A limpeza da sala '{sala.nome_numero}' expirou e está pendente."
-                criar_notificacao_para_responsaveis(sala, mensagem)
-
-                sala.data_notificacao_pendencia = timezone.now()
-                sala.save(update_fields=['data_notificacao_pendencia'])
-
-                salas_notificadas += 1
-
-        if salas_notificadas > 0:
-            self.stdout.write(self.style.SUCCESS(f'{salas_notificadas} sala(s) notificada(s) sobre limpeza pendente.'))
+        if salas_notificadas:
+            # Atualização em lote: evita um UPDATE (e os sinais de Sala.save) por sala.
+            Sala.objects.filter(pk__in=salas_notificadas).update(data_notificacao_pendencia=timezone.now())
+            self.stdout.write(self.style.SUCCESS(f'{len(salas_notificadas)} sala(s) notificada(s) sobre limpeza pendente.'))
         else:
-            self.stdout.write(self.style.SUCCESS('Nenhuma nova limpeza pendente encontrada.'))
\ No newline at end of file
+            self.stdout.write(self.style.SUCCESS('Nenhuma nova limpeza pendente encontrada.'))
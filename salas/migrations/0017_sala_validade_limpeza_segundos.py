@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salas', '0016_generate_initial_pdf_post_imagem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sala',
+            name='validade_limpeza_segundos',
+            field=models.GeneratedField(db_persist=True, expression=models.F('validade_limpeza_horas') * 3600, output_field=models.IntegerField(), verbose_name='Validade da Limpeza (em segundos)'),
+        ),
+    ]
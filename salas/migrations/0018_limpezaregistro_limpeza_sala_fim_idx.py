@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-16 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salas', '0017_sala_validade_limpeza_segundos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='limpezaregistro',
+            index=models.Index(fields=['sala', '-data_hora_fim'], name='limpeza_sala_fim_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salas', '0018_limpezaregistro_limpeza_sala_fim_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='limpezaregistro',
+            index=models.Index(fields=['sala', '-data_hora_inicio'], name='limpeza_sala_inicio_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:20
+
+from django.db import migrations, models
+
+
+def fechar_limpezas_abertas_duplicadas(apps, schema_editor):
+    """
+    Mantém apenas a limpeza em aberto mais recente de cada sala, para que a
+    restrição `one_open_cleaning_per_sala` possa ser criada.
+
+    As demais limpezas em aberto são encerradas no próprio horário de início
+    (duração zero), sem apagar registros nem fotos.
+    """
+    LimpezaRegistro = apps.get_model('salas', 'LimpezaRegistro')
+    abertas = LimpezaRegistro.objects.filter(data_hora_fim__isnull=True)
+    salas_duplicadas = (
+        abertas.values('sala_id')
+        .annotate(total=models.Count('id'))
+        .filter(total__gt=1)
+        .values_list('sala_id', flat=True)
+    )
+    for sala_id in list(salas_duplicadas):
+        registros = abertas.filter(sala_id=sala_id).order_by('-data_hora_inicio', '-id')
+        for registro in registros[1:]:
+            registro.data_hora_fim = registro.data_hora_inicio
+            registro.save(update_fields=['data_hora_fim'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salas', '0019_limpezaregistro_indices_limpeza_aberta'),
+    ]
+
+    operations = [
+        migrations.RunPython(fechar_limpezas_abertas_duplicadas, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='limpezaregistro',
+            constraint=models.UniqueConstraint(condition=models.Q(('data_hora_fim__isnull', True)), fields=('sala',), name='one_open_cleaning_per_sala'),
+        ),
+    ]
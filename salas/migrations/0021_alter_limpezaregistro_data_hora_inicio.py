@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:45
+
+import django.db.models.functions.datetime
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salas', '0020_limpezaregistro_one_open_cleaning_per_sala'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='limpezaregistro',
+            name='data_hora_inicio',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), default=django.utils.timezone.now, verbose_name='Início da Limpeza'),
+        ),
+    ]
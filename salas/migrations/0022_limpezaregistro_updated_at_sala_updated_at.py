@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-16 11:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salas', '0021_alter_limpezaregistro_data_hora_inicio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='limpezaregistro',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Atualizado em'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='sala',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Atualizado em'),
+            preserve_default=False,
+        ),
+    ]
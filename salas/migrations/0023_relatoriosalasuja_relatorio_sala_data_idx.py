@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-16 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salas', '0022_limpezaregistro_updated_at_sala_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='relatoriosalasuja',
+            index=models.Index(fields=['sala', '-data_hora'], name='relatorio_sala_data_idx'),
+        ),
+    ]
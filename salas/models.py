@@ -1,5 +1,7 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Now
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from core.image_utils import get_random_image_path, process_and_save_image
@@ -29,8 +31,12 @@ class Sala(models.Model):
             responsáveis pela sala.
         validade_limpeza_horas (IntegerField): Período em horas que uma
             limpeza é considerada válida.
+        validade_limpeza_segundos (GeneratedField): A mesma validade convertida
+            em segundos, calculada e armazenada pelo banco de dados.
         data_notificacao_pendencia (DateTimeField): Registra quando a última
             notificação de limpeza pendente foi enviada para evitar duplicatas.
+        updated_at (DateTimeField): Momento da última alteração da sala, usado
+            na validação condicional (ETag) da listagem.
     """
     nome_numero = models.CharField(max_length=100, unique=True, verbose_name="Nome/Número")
     capacidade = models.IntegerField(
@@ -65,6 +71,12 @@ class Sala(models.Model):
             MinValueValidator(1, message="A validade da limpeza deve ser de no mínimo 1 hora.")
         ]
     )
+    validade_limpeza_segundos = models.GeneratedField(
+        expression=models.F('validade_limpeza_horas') * 3600,
+        output_field=models.IntegerField(),
+        db_persist=True,
+        verbose_name="Validade da Limpeza (em segundos)"
+    )
     imagem = models.ImageField(
         upload_to=sala_image_path,
         null=True,
@@ -77,6 +89,7 @@ class Sala(models.Model):
         verbose_name="Data da Última Notificação de Pendência",
         help_text="Registra quando a última notificação de limpeza pendente foi enviada."
     )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
 
     class Meta:
@@ -118,22 +131,41 @@ class LimpezaRegistro(models.Model):
             criado automaticamente.
         funcionario_responsavel (ForeignKey): O usuário que registrou a limpeza.
         observacoes (TextField): Notas adicionais sobre a limpeza.
+        updated_at (DateTimeField): Momento da última alteração do registro.
     """
     sala = models.ForeignKey(Sala, on_delete=models.CASCADE, related_name='registros_limpeza', verbose_name="Sala")
     funcionario_responsavel = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name="Funcionário Responsável")
     observacoes = models.TextField(blank=True, null=True, verbose_name="Observações")
 
-    data_hora_inicio = models.DateTimeField(verbose_name="Início da Limpeza")
+    # O ORM preenche o início com `timezone.now`, o mesmo relógio usado em
+    # `data_hora_fim`. O `db_default` vale apenas para inserções feitas
+    # direto no banco, fora do ORM.
+    data_hora_inicio = models.DateTimeField(default=timezone.now, db_default=Now(), verbose_name="Início da Limpeza")
     data_hora_fim = models.DateTimeField(null=True, blank=True, verbose_name="Fim da Limpeza")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
     class Meta:
         """Define metadados para o modelo LimpezaRegistro.
         Configura os nomes de exibição e a ordenação padrão das consultas,
-        mostrando os registros mais recentes primeiro.
+        mostrando os registros mais recentes primeiro. Os índices atendem à
+        busca da última limpeza concluída e da limpeza mais recente de cada
+        sala. A restrição de unicidade parcial garante no máximo uma limpeza
+        em andamento por sala e também serve de índice para essa busca.
         """
         verbose_name = "Registro de Limpeza"
         verbose_name_plural = "Registros de Limpeza"
         ordering = ['-data_hora_inicio']
+        indexes = [
+            models.Index(fields=['sala', '-data_hora_fim'], name='limpeza_sala_fim_idx'),
+            models.Index(fields=['sala', '-data_hora_inicio'], name='limpeza_sala_inicio_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sala'],
+                condition=models.Q(data_hora_fim__isnull=True),
+                name='one_open_cleaning_per_sala'
+            ),
+        ]
 
     def __str__(self):
         status = "Concluída" if self.data_hora_fim else "Iniciada"
@@ -150,6 +182,10 @@ class RelatorioSalaSuja(models.Model):
         verbose_name = "Relatório de Sala Suja"
         verbose_name_plural = "Relatórios de Sala Suja"
         ordering = ['-data_hora']
+        indexes = [
+            # Atende à busca do último relatório de cada sala.
+            models.Index(fields=['sala', '-data_hora'], name='relatorio_sala_data_idx'),
+        ]
 
     def __str__(self):
         return f"Relatório para {self.sala.nome_numero} em {self.data_hora.strftime('%d/%m/%Y %H:%M')}"
@@ -171,8 +207,12 @@ class FotoLimpeza(models.Model):
         verbose_name_plural = "Fotos de Limpeza"
         ordering = ['timestamp']
 
-    def save(self, *args, **kwargs):
-        """Sobrescreve o save para processar a imagem."""
+    def processar_imagem(self):
+        """Redimensiona e recomprime a imagem enviada, mantendo a proporção."""
         # Chama a função genérica, mas com crop_to_square=False para manter a proporção
         process_and_save_image(self.imagem, size=(1280, 1280), crop_to_square=False, quality=80)
+
+    def save(self, *args, **kwargs):
+        """Sobrescreve o save para processar a imagem."""
+        self.processar_imagem()
         super().save(*args, **kwargs)
@@ -1,5 +1,7 @@
+import functools
 import os
 import qrcode
+import tempfile
 from io import BytesIO
 
 from django.conf import settings
@@ -12,22 +14,14 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 
 
-def generate_salas_pdf():
+@functools.cache
+def _get_styles():
     """
-    Gera um arquivo PDF com uma página para cada sala ativa.
+    Monta a folha de estilos usada no PDF de salas.
 
-    A página possui um layout de duas colunas, com o QR Code no canto
-    superior esquerdo e os detalhes textuais da sala à direita. O texto é
-    formatado com quebras de linha, negrito nos rótulos e espaçamento
-    para garantir a legibilidade, respeitando as margens do documento.
+    Os estilos não dependem dos dados das salas, então são criados uma única
+    vez por processo e reaproveitados em todas as gerações do PDF.
     """
-    from .models import Sala
-    file_path = os.path.join(settings.MEDIA_ROOT, 'salas_qr_codes.pdf')
-    salas = Sala.objects.filter(ativa=True).order_by('nome_numero')
-    c = canvas.Canvas(file_path, pagesize=A4)
-    width, height = A4
-    margin = 2 * cm
-
     styles = getSampleStyleSheet()
     styles.add(ParagraphStyle(
         name='BoldLabel',
@@ -51,6 +45,41 @@ def generate_salas_pdf():
         fontSize=18,
         leading=22,
     ))
+    return styles
+
+
+def get_salas_pdf_path():
+    """Retorna o caminho do PDF de QR Codes das salas dentro do MEDIA_ROOT."""
+    return os.path.join(settings.MEDIA_ROOT, 'salas_qr_codes.pdf')
+
+
+def generate_salas_pdf():
+    """
+    Gera um arquivo PDF com uma página para cada sala ativa.
+
+    A página possui um layout de duas colunas, com o QR Code no canto
+    superior esquerdo e os detalhes textuais da sala à direita. O texto é
+    formatado com quebras de linha, negrito nos rótulos e espaçamento
+    para garantir a legibilidade, respeitando as margens do documento.
+
+    O documento é renderizado em memória e o arquivo em disco só é
+    substituído quando o conteúdo muda.
+    """
+    from django.contrib.auth.models import User
+    from django.db.models import Prefetch
+    from .models import Sala
+    file_path = get_salas_pdf_path()
+    pdf_buffer = BytesIO()
+    salas = Sala.objects.filter(ativa=True).order_by('nome_numero').prefetch_related(
+        Prefetch('responsaveis', queryset=User.objects.only('username'))
+    ).iterator(chunk_size=200)
+    # `invariant=1` remove a data de criação e o ID aleatório do documento,
+    # de modo que os mesmos dados sempre produzem os mesmos bytes.
+    c = canvas.Canvas(pdf_buffer, pagesize=A4, invariant=1)
+    width, height = A4
+    margin = 2 * cm
+
+    styles = _get_styles()
 
     for sala in salas:
         qr_size = 6 * cm
@@ -113,3 +142,41 @@ def generate_salas_pdf():
         c.showPage()
 
     c.save()
+    _write_if_changed(file_path, pdf_buffer.getvalue())
+
+
+def _write_if_changed(file_path, content):
+    """
+    Grava `content` em `file_path` apenas se ele for diferente do arquivo atual.
+
+    Quando o PDF não muda, o arquivo (e sua data de modificação) é preservado,
+    o que permite que clientes e servidores de arquivos estáticos continuem
+    respondendo `304 Not Modified`. A escrita é feita em um arquivo temporário
+    substituído atomicamente, para que nunca seja servido um PDF incompleto.
+    """
+    try:
+        with open(file_path, 'rb') as existing:
+            if existing.read() == content:
+                return
+    except FileNotFoundError:
+        pass
+
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+    # Nome temporário único: processos que regeneram o PDF ao mesmo tempo não
+    # escrevem no mesmo arquivo.
+    tmp = tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False)
+    tmp_path = tmp.name
+    try:
+        with tmp:
+            tmp.write(content)
+        # `NamedTemporaryFile` cria o arquivo com permissão 0600; o PDF precisa
+        # continuar legível pelo servidor de arquivos.
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -1,33 +1,134 @@
 from rest_framework import serializers
-from .models import Sala, LimpezaRegistro, FotoLimpeza, RelatorioSalaSuja
-from django.contrib.auth.models import User
-from django.utils import timezone
+from rest_framework.relations import MANY_RELATION_KWARGS
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Prefetch, prefetch_related_objects
+from django.utils.encoding import smart_str
+from .models import Sala, LimpezaRegistro, FotoLimpeza
+from django.contrib.auth.models import User, Group
 from core.serializers import RelativeImageField
 
 
-class RelatorioSalaSujaSerializer(serializers.ModelSerializer):
+# Chave, no cache do Django, do ID do grupo 'Zeladoria'.
+_ZELADORIA_GROUP_CACHE_KEY = 'salas:zeladoria_group_id'
+_ZELADORIA_GROUP_CACHE_TIMEOUT = 3600
+
+# Instância reaproveitada para formatar datas exatamente como um
+# `DateTimeField` do DRF, sem instanciar um serializador por objeto.
+_DATA_HORA_FIELD = serializers.DateTimeField()
+
+
+def _zeladoria_users():
     """
-    Serializa os dados essenciais de um relatório de sala suja para aninhamento.
+    Retorna o queryset de usuários pertencentes ao grupo 'Zeladoria'.
+
+    O ID do grupo fica no cache do Django e é reaproveitado, de modo que a
+    consulta filtra diretamente por `groups__id`, sem o JOIN com a tabela de
+    grupos para comparar o nome a cada validação. Apenas as colunas usadas na
+    validação e na associação (`id` e `username`) são carregadas.
     """
-    reportado_por = serializers.SlugRelatedField(
-        slug_field='username',
-        read_only=True
-    )
+    group_id = cache.get(_ZELADORIA_GROUP_CACHE_KEY)
+    if group_id is None:
+        group_id = Group.objects.filter(name='Zeladoria').values_list('pk', flat=True).first()
+        if group_id is None:
+            return User.objects.none()
+        cache.set(_ZELADORIA_GROUP_CACHE_KEY, group_id, _ZELADORIA_GROUP_CACHE_TIMEOUT)
+    return User.objects.filter(groups__id=group_id).only('id', 'username')
 
-    class Meta:
-        model = RelatorioSalaSuja
-        fields = ['data_hora', 'reportado_por', 'observacoes']
+
+def limpar_cache_zeladoria():
+    """
+    Descarta o ID do grupo 'Zeladoria' guardado por `_zeladoria_users()`.
+
+    Chamada pelos sinais de `Group` quando um grupo é criado, renomeado ou
+    removido. A invalidação vale para todos os processos apenas quando o
+    cache configurado é compartilhado (Redis, Memcached, banco); com o cache
+    padrão em memória (`LocMemCache`), os demais processos mantêm o ID antigo
+    até o fim do prazo de `_ZELADORIA_GROUP_CACHE_TIMEOUT` (uma hora).
+    """
+    cache.delete(_ZELADORIA_GROUP_CACHE_KEY)
+
+
+class ZeladoriaManyRelatedField(serializers.ManyRelatedField):
+    """
+    `ManyRelatedField` que resolve todos os slugs recebidos em uma única
+    consulta `__in`, em vez de uma consulta `get()` por item.
+
+    A ordem e eventuais repetições da entrada são preservadas, assim como as
+    mensagens de erro do campo filho. Os slugs são comparados como texto, de
+    modo que uma entrada de outro tipo (por exemplo, um número) encontra a
+    mesma linha que o banco devolveu para ela.
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        slug_field = child.slug_field
+        try:
+            encontrados = {
+                str(getattr(obj, slug_field)): obj
+                for obj in child.get_queryset().filter(**{f'{slug_field}__in': data})
+            }
+            resolvidos = []
+            for item in data:
+                chave = str(item)
+                if chave not in encontrados:
+                    child.fail('does_not_exist', slug_name=slug_field, value=smart_str(item))
+                resolvidos.append(encontrados[chave])
+        except (TypeError, ValueError):
+            child.fail('invalid')
+        return resolvidos
+
+
+class ZeladoriaSlugRelatedField(serializers.SlugRelatedField):
+    """
+    `SlugRelatedField` restrito aos usuários do grupo 'Zeladoria'.
+
+    O queryset é resolvido por `_zeladoria_users()` no momento do uso, em vez
+    de ser fixado na definição da classe do serializador. Com `many=True`, o
+    campo é envolvido por `ZeladoriaManyRelatedField`.
+    """
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ZeladoriaManyRelatedField(**list_kwargs)
+
+    def get_queryset(self):
+        return _zeladoria_users()
+
+
+class SalaListSerializer(serializers.ListSerializer):
+    """
+    Serializador de listas de salas que carrega os responsáveis em lote.
+
+    Antes de serializar cada sala, os responsáveis de todas as salas da lista
+    são buscados com uma única consulta. Salas que já vieram com os
+    responsáveis pré-carregados (como no `SalaViewSet`) não geram consultas
+    extras.
+    """
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        salas = list(iterable)
+        prefetch_related_objects(
+            salas, Prefetch('responsaveis', queryset=User.objects.only('id', 'username'))
+        )
+        return [self.child.to_representation(sala) for sala in salas]
 
 
 class SalaSerializer(serializers.ModelSerializer):
     """Serializa os dados do modelo Sala para a API."""
-    responsaveis = serializers.SlugRelatedField(
+    responsaveis = ZeladoriaSlugRelatedField(
         many=True,
         slug_field='username',
-        queryset=User.objects.filter(groups__name='Zeladoria'),
         required=False
     )
-    status_limpeza = serializers.SerializerMethodField()
+    status_limpeza = serializers.CharField(source='status_limpeza_anotado', read_only=True)
     ultima_limpeza_data_hora = serializers.DateTimeField(source='ultima_limpeza_fim', read_only=True)
     ultima_limpeza_funcionario = serializers.CharField(source='ultimo_funcionario', read_only=True)
     ativa = serializers.BooleanField(required=False, default=True)
@@ -45,6 +146,7 @@ class SalaSerializer(serializers.ModelSerializer):
             'id', 'qr_code_id', 'status_limpeza', 'ultima_limpeza_data_hora', 'ultima_limpeza_funcionario',
             'detalhes_suja'
         ]
+        list_serializer_class = SalaListSerializer
 
     def to_internal_value(self, data):
         """
@@ -91,49 +193,27 @@ class SalaSerializer(serializers.ModelSerializer):
 
         return super().update(instance, validated_data)
 
-    def get_status_limpeza(self, obj):
-        if hasattr(obj, 'limpeza_em_andamento'):
-            if obj.limpeza_em_andamento:
-                return "Em Limpeza"
-        elif obj.registros_limpeza.filter(data_hora_fim__isnull=True).exists():
-            return "Em Limpeza"
-
-        ultima_limpeza_fim = getattr(obj, 'ultima_limpeza_fim',
-                                     obj.registros_limpeza.filter(data_hora_fim__isnull=False).order_by(
-                                         '-data_hora_fim').values_list('data_hora_fim', flat=True).first())
-
-        ultimo_relatorio_suja_data = getattr(obj, 'ultimo_relatorio_suja_data',
-                                             obj.relatorios_suja.order_by('-data_hora').values_list('data_hora',
-                                                                                                    flat=True).first())
-
-        if ultimo_relatorio_suja_data and (not ultima_limpeza_fim or ultimo_relatorio_suja_data > ultima_limpeza_fim):
-            return "Suja"
-
-        if ultima_limpeza_fim:
-            validade_em_segundos = obj.validade_limpeza_horas * 3600
-            tempo_decorrido = (timezone.now() - ultima_limpeza_fim).total_seconds()
-            if tempo_decorrido < validade_em_segundos:
-                return "Limpa"
-
-        return "Limpeza Pendente"
-
     def get_detalhes_suja(self, obj: Sala) -> dict | None:
         """
         Retorna os detalhes do último relatório de sujeira se a sala estiver
         efetivamente no estado 'SUJA'. Caso contrário, retorna null.
         """
-        ultima_limpeza_fim = getattr(obj, 'ultima_limpeza_fim',
-                                     obj.registros_limpeza.filter(data_hora_fim__isnull=False).order_by(
-                                         '-data_hora_fim').values_list('data_hora_fim', flat=True).first())
+        ultima_limpeza_fim = obj.ultima_limpeza_fim
+        ultimo_relatorio_suja_data = obj.ultimo_relatorio_suja_data
 
-        ultimo_relatorio_suja = obj.relatorios_suja.order_by('-data_hora').first()
+        # As anotações já indicam se há um relatório posterior à última
+        # limpeza e trazem os dados desse relatório, então os detalhes são
+        # montados sem consultas nem serializador aninhado.
+        if not ultimo_relatorio_suja_data:
+            return None
+        if ultima_limpeza_fim and ultimo_relatorio_suja_data <= ultima_limpeza_fim:
+            return None
 
-        if ultimo_relatorio_suja:
-            ultimo_relatorio_suja_data = ultimo_relatorio_suja.data_hora
-            if not ultima_limpeza_fim or ultimo_relatorio_suja_data > ultima_limpeza_fim:
-                return RelatorioSalaSujaSerializer(ultimo_relatorio_suja).data
-
-        return None
+        return {
+            'data_hora': _DATA_HORA_FIELD.to_representation(ultimo_relatorio_suja_data),
+            'reportado_por': obj.ultimo_relatorio_suja_reportado_por,
+            'observacoes': obj.ultimo_relatorio_suja_observacoes,
+        }
 
 
 class FotoLimpezaSerializer(serializers.ModelSerializer):
@@ -165,3 +245,22 @@ class LimpezaRegistroSerializer(serializers.ModelSerializer):
         model = LimpezaRegistro
         fields = ['id', 'sala', 'sala_nome', 'data_hora_inicio', 'data_hora_fim',
                   'funcionario_responsavel', 'observacoes', 'fotos']
+
+
+class LimpezaRegistroResumoSerializer(serializers.Serializer):
+    """
+    Serializa o resumo de um registro de limpeza a partir de um dicionário
+    produzido por `QuerySet.values()`, sem instanciar modelos.
+
+    As chaves de saída são as mesmas de `LimpezaRegistroSerializer`, exceto
+    `fotos`, que não faz parte do resumo.
+    """
+    id = serializers.IntegerField()
+    sala = serializers.UUIDField(source='sala__qr_code_id')
+    sala_nome = serializers.CharField(source='sala__nome_numero')
+    data_hora_inicio = serializers.DateTimeField()
+    data_hora_fim = serializers.DateTimeField(allow_null=True)
+    funcionario_responsavel = serializers.CharField(
+        source='funcionario_responsavel__username', allow_null=True
+    )
+    observacoes = serializers.CharField(allow_null=True)
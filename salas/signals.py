@@ -1,19 +1,78 @@
+import logging
+import os
+from django.db import connections, transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.contrib.auth.models import Group
 from .models import Sala, RelatorioSalaSuja, LimpezaRegistro
-from .pdf_generator import generate_salas_pdf
+from .serializers import limpar_cache_zeladoria
+from .pdf_generator import generate_salas_pdf, get_salas_pdf_path
+from .tasks import agendar_geracao_pdf
 from core.notification_service import criar_notificacao_para_responsaveis # Adicionar import
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
+def _agendar_pdf_apos_commit():
+    """
+    Registra a geração do PDF para o commit da transação atual.
+
+    Várias salas salvas na mesma transação registram várias chamadas; elas
+    são agrupadas por `salas.tasks.agendar_geracao_pdf`, que executa no
+    máximo uma geração adicional enquanto outra está em andamento.
+    """
+    transaction.on_commit(agendar_geracao_pdf)
+
+def _eh_banco_de_teste(alias):
+    """Indica se o banco `alias` é um banco criado para a suíte de testes."""
+    conexao = connections[alias]
+    nome = str(conexao.settings_dict['NAME'])
+    nome_teste = conexao.settings_dict.get('TEST', {}).get('NAME')
+    if nome_teste and nome == nome_teste:
+        return True
+    if conexao.vendor == 'sqlite' and conexao.creation.is_in_memory_db(nome):
+        return True
+    return os.path.basename(nome).startswith('test_')
+
+def gerar_pdf_inicial(sender, using, plan=None, **kwargs):
+    """
+    Gera o PDF de salas ao fim do `migrate`, caso ele ainda não exista.
+
+    Conectado ao `post_migrate` da própria aplicação em `SalasConfig.ready`.
+    Só age quando o `migrate` aplicou migrações de `salas` em um banco que
+    não é de testes. Um PDF existente não é substituído, e erros são apenas
+    registrados, sem interromper o `migrate`.
+    """
+    if not plan or not any(migracao.app_label == 'salas' for migracao, _ in plan):
+        return
+    if _eh_banco_de_teste(using) or os.path.exists(get_salas_pdf_path()):
+        return
+    try:
+        logger.info("Gerando PDF inicial com as salas existentes.")
+        generate_salas_pdf()
+        logger.info("PDF inicial gerado com sucesso.")
+    except Exception:
+        logger.exception("Ocorreu um erro ao gerar o PDF inicial.")
+
 @receiver(post_save, sender=Sala)
 def sala_post_save_handler(sender, instance, **kwargs):
-    """Gera o PDF de salas sempre que uma instância de Sala é salva."""
-    generate_salas_pdf()
+    """
+    Agenda a geração do PDF de salas sempre que uma instância de Sala é salva.
+
+    A geração só é agendada após o commit da transação e roda fora da thread
+    da requisição (ver `salas.tasks.agendar_geracao_pdf`).
+    """
+    _agendar_pdf_apos_commit()
 
 @receiver(post_delete, sender=Sala)
 def sala_post_delete_handler(sender, instance, **kwargs):
-    """Gera o PDF de salas sempre que uma instância de Sala é deletada."""
-    generate_salas_pdf()
+    """Agenda a geração do PDF de salas sempre que uma instância de Sala é deletada."""
+    _agendar_pdf_apos_commit()
+
+@receiver([post_save, post_delete], sender=Group)
+def group_changed_handler(sender, instance, **kwargs):
+    """Invalida o ID do grupo 'Zeladoria' em cache quando algum grupo muda."""
+    limpar_cache_zeladoria()
 
 @receiver(post_save, sender=RelatorioSalaSuja)
 def notificar_sala_suja(sender, instance, created, **kwargs):
@@ -0,0 +1,63 @@
+import logging
+import threading
+
+from django.db import connection
+
+from .pdf_generator import generate_salas_pdf
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_geracao_pendente = False
+_worker_ativo = False
+
+
+def agendar_geracao_pdf():
+    """
+    Agenda a regeneração do PDF de salas fora da thread da requisição.
+
+    A geração roda em uma única thread de trabalho por processo. Pedidos
+    feitos enquanto uma geração está em andamento são agrupados em uma única
+    nova geração, executada logo após a atual, de modo que uma rajada de
+    alterações em salas produz no máximo duas renderizações.
+    """
+    global _geracao_pendente, _worker_ativo
+    with _lock:
+        _geracao_pendente = True
+        if _worker_ativo:
+            return
+        _worker_ativo = True
+
+    try:
+        threading.Thread(target=_executar_geracoes_pendentes, name='salas-pdf').start()
+    except Exception:
+        # Sem a thread, o indicador precisa ser liberado; caso contrário,
+        # nenhum pedido futuro voltaria a iniciar a geração.
+        with _lock:
+            _worker_ativo = False
+        raise
+
+
+def _executar_geracoes_pendentes():
+    """Gera o PDF enquanto houver pedidos pendentes e encerra a thread."""
+    global _geracao_pendente, _worker_ativo
+    try:
+        while True:
+            with _lock:
+                if not _geracao_pendente:
+                    _worker_ativo = False
+                    return
+                _geracao_pendente = False
+            try:
+                generate_salas_pdf()
+            except Exception:
+                logger.exception("Falha ao gerar o PDF de salas.")
+    except BaseException:
+        # Saída inesperada: libera o indicador para que um novo pedido possa
+        # iniciar outra thread. Na saída normal ele já foi liberado no laço.
+        with _lock:
+            _worker_ativo = False
+        raise
+    finally:
+        connection.close()
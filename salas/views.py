@@ -1,18 +1,66 @@
-from rest_framework import viewsets, status, parsers, mixins
+import csv
+import functools
+import hashlib
+from rest_framework import viewsets, status, parsers, mixins, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from datetime import timedelta
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import OuterRef, Subquery, Exists
+from django.db import transaction, IntegrityError
+from django.db.models import (
+    Q, F, OuterRef, Subquery, Exists, Prefetch, Case, When, Value, Count, Max,
+    CharField, ExpressionWrapper, DateTimeField, DurationField
+)
+from django.db.models.functions import Coalesce
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Sala, LimpezaRegistro, RelatorioSalaSuja, FotoLimpeza
 from .filters import SalaFilter, LimpezaRegistroFilter
-from .serializers import SalaSerializer, LimpezaRegistroSerializer, FotoLimpezaSerializer
+from .serializers import (
+    SalaSerializer, LimpezaRegistroSerializer, LimpezaRegistroResumoSerializer, FotoLimpezaSerializer
+)
 from core.permissions import IsAdminUser, IsZeladorUser, IsSolicitanteServicosUser, IsAdminOrZeladoria
+from core.pagination import CachedCountPagination
+from core.views import SkipEmptyFiltersMixin
 
 
-class SalaViewSet(viewsets.ModelViewSet):
+class _Echo:
+    """Pseudo-arquivo que devolve o que recebe, para gerar linhas de CSV sob demanda."""
+    def write(self, value):
+        return value
+
+
+def _agregado_da_tabela(queryset, agregacao):
+    """
+    Retorna uma subconsulta escalar com `agregacao` calculada sobre toda a
+    tabela de `queryset`, para ser usada dentro de outra consulta.
+
+    O agrupamento por uma constante não gera `GROUP BY`, então a subconsulta
+    devolve sempre uma única linha.
+    """
+    return Subquery(
+        queryset.order_by().annotate(_tabela=Value(1)).values('_tabela')
+        .annotate(valor=agregacao).values('valor')
+    )
+
+
+@functools.cache
+def _instanciar_permissoes(permission_classes):
+    """
+    Retorna uma tupla com instâncias das classes de permissão, criadas uma
+    única vez por processo para cada combinação.
+
+    As permissões usadas aqui não guardam estado, então as mesmas instâncias
+    podem ser compartilhadas entre requisições.
+    """
+    return tuple(permission() for permission in permission_classes)
+
+
+class SalaViewSet(SkipEmptyFiltersMixin, viewsets.ModelViewSet):
     """Gerencia as operações CRUD para o modelo Sala.
     Fornece endpoints para criar, ler, atualizar e deletar salas, com
     permissões de acesso granulares e uma ação customizada para registrar
@@ -21,10 +69,38 @@ class SalaViewSet(viewsets.ModelViewSet):
     queryset = Sala.objects.all().order_by('nome_numero')
     serializer_class = SalaSerializer
     filterset_class = SalaFilter
+    pagination_class = CachedCountPagination
     lookup_field = 'qr_code_id'
     lookup_value_regex = '[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
 
+    # Classes de permissão por ação, consultadas em `get_permissions`. Ações
+    # ausentes do mapa usam `permissoes_padrao`.
+    permissoes_por_acao = {
+        'create': (IsAdminUser,),
+        'update': (IsAdminUser,),
+        'partial_update': (IsAdminUser,),
+        'destroy': (IsAdminUser,),
+        'iniciar_limpeza': (IsZeladorUser,),
+        'concluir_limpeza': (IsZeladorUser,),
+        'marcar_como_suja': (IsSolicitanteServicosUser,),
+        'list': (IsAuthenticated,),
+        'retrieve': (IsAuthenticated,),
+    }
+    permissoes_padrao = (IsAdminUser,)
+
+    # Ações de detalhe que buscam a sala sem as anotações de status.
+    acoes_sem_anotacoes = (
+        'concluir_limpeza', 'marcar_como_suja', 'destroy', 'update', 'partial_update'
+    )
+
+    # Colunas de `Sala` lidas pelo `SalaSerializer`. Nas ações somente leitura,
+    # o queryset carrega apenas estas colunas.
+    campos_serializados = (
+        'id', 'qr_code_id', 'nome_numero', 'capacidade', 'validade_limpeza_horas',
+        'descricao', 'instrucoes', 'localizacao', 'ativa', 'imagem'
+    )
+
     def get_permissions(self):
         """Define as permissões de acesso dinamicamente por ação.
         Restringe as operações de escrita (`create`, `update`, `destroy`) a
@@ -33,17 +109,9 @@ class SalaViewSet(viewsets.ModelViewSet):
         Returns:
             list: Uma lista de instâncias de classes de permissão.
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
-            permission_classes = [IsAdminUser]
-        elif self.action in ['iniciar_limpeza', 'concluir_limpeza']:
-            permission_classes = [IsZeladorUser]
-        elif self.action == 'marcar_como_suja':
-            permission_classes = [IsSolicitanteServicosUser]
-        elif self.action in ['list', 'retrieve']:
-            permission_classes = [IsAuthenticated]
-        else:
-            permission_classes = [IsAdminUser]
-        return [permission() for permission in permission_classes]
+        permission_classes = self.permissoes_por_acao.get(self.action, self.permissoes_padrao)
+        # A tupla em cache é imutável; cada chamada recebe uma lista nova.
+        return list(_instanciar_permissoes(permission_classes))
 
     def get_queryset(self):
         """Otimiza a consulta principal do ViewSet para evitar o problema N+1."""
@@ -57,7 +125,9 @@ class SalaViewSet(viewsets.ModelViewSet):
             sala=OuterRef('pk')
         ).order_by('-data_hora')
 
-        queryset = Sala.objects.prefetch_related('responsaveis').annotate(
+        queryset = Sala.objects.prefetch_related(
+            Prefetch('responsaveis', queryset=User.objects.only('id', 'username'))
+        ).annotate(
             ultima_limpeza_fim=Subquery(
                 ultimos_registros_concluidos.values('data_hora_fim')[:1]
             ),
@@ -69,30 +139,175 @@ class SalaViewSet(viewsets.ModelViewSet):
             ),
             ultimo_relatorio_suja_data=Subquery(
                 ultimos_relatorios_suja.values('data_hora')[:1]
+            ),
+            ultimo_relatorio_suja_reportado_por=Subquery(
+                ultimos_relatorios_suja.values('reportado_por__username')[:1]
+            ),
+            ultimo_relatorio_suja_observacoes=Subquery(
+                ultimos_relatorios_suja.values('observacoes')[:1]
+            )
+        )
+
+        # O status de limpeza é calculado pelo banco, na mesma consulta, a
+        # partir das anotações acima. A ordem das cláusulas `When` define a
+        # precedência: Em Limpeza > Suja > Limpa > Limpeza Pendente.
+        duration_expr = ExpressionWrapper(
+            F('validade_limpeza_segundos') * timedelta(seconds=1),
+            output_field=DurationField()
+        )
+        condicao_suja = Q(ultimo_relatorio_suja_data__isnull=False) & (
+            Q(ultima_limpeza_fim__isnull=True) | Q(ultimo_relatorio_suja_data__gt=F('ultima_limpeza_fim'))
+        )
+        queryset = queryset.annotate(
+            limpeza_expira_em=ExpressionWrapper(
+                F('ultima_limpeza_fim') + duration_expr,
+                output_field=DateTimeField()
+            )
+        ).annotate(
+            status_limpeza_anotado=Case(
+                When(limpeza_em_andamento=True, then=Value('Em Limpeza')),
+                When(condicao_suja, then=Value('Suja')),
+                When(limpeza_expira_em__gt=timezone.now(), then=Value('Limpa')),
+                default=Value('Limpeza Pendente'),
+                output_field=CharField()
             )
         )
+
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.only(*self.campos_serializados)
         return queryset
 
+    def get_list_etag(self, request):
+        """
+        Calcula o ETag da listagem de salas.
+
+        O valor muda quando uma sala ou um registro de limpeza é criado,
+        alterado ou removido (`updated_at` e total), quando um relatório de
+        sala suja é criado, e quando a limpeza de alguma sala expira com o
+        passar do tempo. O usuário e a URL completa (com os filtros) também
+        entram no cálculo, pois mudam o conteúdo da resposta.
+
+        O cálculo é uma única consulta de agregação na tabela de salas, com a
+        subconsulta da última limpeza concluída e subconsultas escalares para
+        os totais de registros e de relatórios. É mais barato que a listagem,
+        mas não é gratuito.
+
+        Limitação: alterações em usuários (por exemplo, a troca de um
+        `username` exibido em `responsaveis` ou `ultima_limpeza_funcionario`)
+        não mudam o ETag; elas aparecem na próxima mudança de uma das
+        tabelas acima.
+        """
+        ultima_limpeza_fim = Subquery(
+            LimpezaRegistro.objects.filter(
+                sala=OuterRef('pk'), data_hora_fim__isnull=False
+            ).order_by('-data_hora_fim').values('data_hora_fim')[:1]
+        )
+        duration_expr = ExpressionWrapper(
+            F('validade_limpeza_segundos') * timedelta(seconds=1),
+            output_field=DurationField()
+        )
+        estado = Sala.objects.annotate(
+            limpeza_expira_em=ExpressionWrapper(ultima_limpeza_fim + duration_expr, output_field=DateTimeField())
+        ).aggregate(
+            total=Count('id'),
+            atualizado=Max('updated_at'),
+            expiradas=Count('id', filter=Q(limpeza_expira_em__lte=timezone.now())),
+            registros_total=Max(_agregado_da_tabela(LimpezaRegistro.objects, Count('id'))),
+            registros_atualizado=Max(_agregado_da_tabela(LimpezaRegistro.objects, Max('updated_at'))),
+            relatorios_total=Max(_agregado_da_tabela(RelatorioSalaSuja.objects, Count('id'))),
+            relatorios_ultimo=Max(_agregado_da_tabela(RelatorioSalaSuja.objects, Max('data_hora'))),
+        )
+
+        chave = f'{request.user.pk}:{request.get_full_path()}:{estado}'
+        return quote_etag(hashlib.md5(chave.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lista as salas com suporte a requisições condicionais.
+
+        Quando o cabeçalho `If-None-Match` traz o ETag atual, a resposta é
+        `304 Not Modified`: é feita apenas a consulta do ETag, sem a
+        consulta da listagem e sem serializar as salas.
+        """
+        etag = self.get_list_etag(request)
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+    def get_object(self):
+        """
+        Busca a sala do detalhe sem as anotações de status nas ações que
+        não as utilizam.
+
+        As ações de escrita só precisam da linha da sala; para elas a consulta
+        é feita direto na tabela, sem as subconsultas de `get_queryset`. Em
+        `update` e `partial_update`, a sala devolvida na resposta é recarregada
+        com as anotações por `perform_update`. As permissões de objeto
+        continuam sendo verificadas.
+        """
+        if self.action not in self.acoes_sem_anotacoes:
+            return super().get_object()
+
+        sala = get_object_or_404(Sala.objects.all(), qr_code_id=self.kwargs[self.lookup_field])
+        self.check_object_permissions(self.request, sala)
+        return sala
+
+    def perform_create(self, serializer):
+        """Salva a nova sala e a recarrega com as anotações de `get_queryset`.
+
+        O `SalaSerializer` lê o status de limpeza exclusivamente das anotações,
+        portanto a instância devolvida na resposta precisa vir do queryset
+        anotado.
+        """
+        sala = serializer.save()
+        serializer.instance = self.get_queryset().get(pk=sala.pk)
+
+    def perform_update(self, serializer):
+        """Salva as alterações e recarrega a sala com as anotações atualizadas."""
+        sala = serializer.save()
+        serializer.instance = self.get_queryset().get(pk=sala.pk)
+
     @action(detail=True, methods=['post'], permission_classes=[IsZeladorUser])
     def iniciar_limpeza(self, request, qr_code_id=None):
-        """Cria um novo registro para marcar o início de uma limpeza."""
-        with transaction.atomic():  # Garante a atomicidade da operação
-            sala = Sala.objects.select_for_update().get(qr_code_id=qr_code_id)
+        """
+        Cria um novo registro para marcar o início de uma limpeza.
+
+        A unicidade da limpeza em andamento é garantida pela restrição
+        `one_open_cleaning_per_sala` do banco: uma segunda tentativa
+        concorrente falha no INSERT, sem necessidade de travar a sala.
+        """
+        # Apenas as colunas usadas aqui e na resposta são carregadas.
+        sala = get_object_or_404(
+            Sala.objects.only('id', 'ativa', 'qr_code_id', 'nome_numero'),
+            qr_code_id=qr_code_id
+        )
+        self.check_object_permissions(request, sala)
 
-            if not sala.ativa:
-                return Response(
-                    {'detail': 'Salas inativas não podem ter a limpeza iniciada.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        if not sala.ativa:
+            return Response(
+                {'detail': 'Salas inativas não podem ter a limpeza iniciada.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-            if LimpezaRegistro.objects.filter(sala=sala, data_hora_fim__isnull=True).exists():
-                return Response({'detail': 'Esta sala já está em processo de limpeza.'},
-                                status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                registro = LimpezaRegistro.objects.create(sala=sala, funcionario_responsavel=request.user)
+        except IntegrityError:
+            # Só a violação de `one_open_cleaning_per_sala` vira erro de
+            # negócio; outras falhas de integridade (como a sala ter sido
+            # excluída no meio do caminho) seguem como erro do servidor.
+            if not LimpezaRegistro.objects.filter(sala=sala, data_hora_fim__isnull=True).exists():
+                raise
+            return Response({'detail': 'Esta sala já está em processo de limpeza.'},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-            registro = LimpezaRegistro.objects.create(sala=sala, funcionario_responsavel=request.user,
-                                                      data_hora_inicio=timezone.now())
-            serializer = LimpezaRegistroSerializer(registro)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        # Sala e funcionário já estão carregados na instância.
+        serializer = LimpezaRegistroSerializer(registro)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['post'], permission_classes=[IsZeladorUser])
     def concluir_limpeza(self, request, qr_code_id=None):
@@ -105,25 +320,35 @@ class SalaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        registro_aberto = LimpezaRegistro.objects.filter(sala=sala, data_hora_fim__isnull=True).order_by(
-            '-data_hora_inicio').first()
+        # A existência de fotos e o funcionário (exibido na resposta) vêm na
+        # mesma consulta do registro em aberto.
+        registro_aberto = LimpezaRegistro.objects.filter(
+            sala=sala, data_hora_fim__isnull=True
+        ).select_related('funcionario_responsavel').annotate(
+            possui_fotos=Exists(FotoLimpeza.objects.filter(registro_limpeza=OuterRef('pk')))
+        ).order_by('-data_hora_inicio').first()
 
         if not registro_aberto:
             return Response({'detail': 'Nenhuma limpeza foi iniciada para esta sala.'},
                             status=status.HTTP_400_BAD_REQUEST)
 
         # Regra de negócio: Verifica se pelo menos uma foto foi enviada
-        if not registro_aberto.fotos.exists():
+        if not registro_aberto.possui_fotos:
             return Response({'detail': 'É necessário enviar pelo menos uma foto antes de concluir a limpeza.'},
                             status=status.HTTP_400_BAD_REQUEST)
 
+        # A sala já foi carregada; evita uma nova consulta ao serializar `sala` e `sala_nome`.
+        registro_aberto.sala = sala
         registro_aberto.data_hora_fim = timezone.now()
         registro_aberto.observacoes = request.data.get('observacoes', registro_aberto.observacoes)
-        registro_aberto.save()
+        registro_aberto.save(update_fields=['data_hora_fim', 'observacoes', 'updated_at'])
 
         if sala.data_notificacao_pendencia:
+            # UPDATE direto de uma coluna: dispensa o `Sala.save()` (e o
+            # processamento de imagem e o sinal de regeneração do PDF), já que
+            # nenhum dado impresso no PDF mudou.
+            Sala.objects.filter(pk=sala.pk).update(data_notificacao_pendencia=None)
             sala.data_notificacao_pendencia = None
-            sala.save(update_fields=['data_notificacao_pendencia'])
 
         serializer = LimpezaRegistroSerializer(registro_aberto)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -160,10 +385,11 @@ class SalaViewSet(viewsets.ModelViewSet):
                 {'detail': 'Salas inativas não podem ser excluídas. Ative a sala primeiro.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        return super().destroy(request, *args, **kwargs)
+        self.perform_destroy(sala)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class LimpezaRegistroViewSet(viewsets.ReadOnlyModelViewSet):
+class LimpezaRegistroViewSet(SkipEmptyFiltersMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para a visualização do histórico de registros de limpeza.
 
@@ -180,6 +406,7 @@ class LimpezaRegistroViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = LimpezaRegistro.objects.all()
     serializer_class = LimpezaRegistroSerializer
     permission_classes = [IsAdminOrZeladoria]
+    pagination_class = CachedCountPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = LimpezaRegistroFilter
 
@@ -193,7 +420,9 @@ class LimpezaRegistroViewSet(viewsets.ReadOnlyModelViewSet):
           aqueles onde o usuário é o funcionário responsável.
 
         As consultas são otimizadas com `select_related` e `prefetch_related`
-        para garantir a performance da listagem.
+        para garantir a performance da listagem, e `only()` limita as colunas
+        carregadas da sala, do funcionário e das fotos ao que o serializador
+        exibe.
 
         Returns:
             Um QuerySet de objetos `LimpezaRegistro` filtrado de acordo com
@@ -202,7 +431,16 @@ class LimpezaRegistroViewSet(viewsets.ReadOnlyModelViewSet):
         user = self.request.user
         base_queryset = LimpezaRegistro.objects.select_related(
             'sala', 'funcionario_responsavel'
-        ).prefetch_related('fotos').order_by('-data_hora_fim')
+        ).only(
+            'id', 'data_hora_inicio', 'data_hora_fim', 'observacoes',
+            'sala__qr_code_id', 'sala__nome_numero',
+            'funcionario_responsavel__username'
+        ).prefetch_related(
+            Prefetch(
+                'fotos',
+                queryset=FotoLimpeza.objects.only('id', 'imagem', 'timestamp', 'registro_limpeza_id')
+            )
+        ).order_by('-data_hora_fim')
 
         if user.is_superuser:
             return base_queryset
@@ -211,6 +449,51 @@ class LimpezaRegistroViewSet(viewsets.ReadOnlyModelViewSet):
         # pertence ao grupo 'Zeladoria'.
         return base_queryset.filter(funcionario_responsavel=user)
 
+    def get_resumo_queryset(self):
+        """
+        Retorna os registros visíveis e filtrados como dicionários (`values()`),
+        com apenas as colunas do resumo e sem o carregamento das fotos.
+        """
+        return self.filter_queryset(self.get_queryset()).prefetch_related(None).values(
+            'id', 'sala__qr_code_id', 'sala__nome_numero', 'data_hora_inicio',
+            'data_hora_fim', 'funcionario_responsavel__username', 'observacoes'
+        )
+
+    @action(detail=False, methods=['get'])
+    def resumo(self, request):
+        """
+        Lista o histórico de limpezas em formato resumido, sem as fotos.
+
+        Aplica as mesmas regras de visibilidade e os mesmos filtros da listagem
+        completa, mas lê apenas as colunas necessárias via `values()`, sem
+        instanciar modelos nem carregar as fotos de cada registro.
+        """
+        serializer = LimpezaRegistroResumoSerializer(self.get_resumo_queryset(), many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Exporta o histórico de limpezas em CSV, transmitido em partes.
+
+        Usa os mesmos filtros, regras de visibilidade e colunas do `resumo`.
+        Os registros são lidos do banco em lotes (`iterator`) e cada linha é
+        enviada assim que formatada, de modo que a memória usada não cresce
+        com o tamanho do histórico.
+        """
+        registros = self.get_resumo_queryset().iterator(chunk_size=2000)
+        formatador = LimpezaRegistroResumoSerializer()
+        writer = csv.writer(_Echo())
+
+        def linhas():
+            yield writer.writerow(formatador.fields.keys())
+            for registro in registros:
+                yield writer.writerow(formatador.to_representation(registro).values())
+
+        response = StreamingHttpResponse(linhas(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="historico_limpezas.csv"'
+        return response
+
 
 class FotoLimpezaViewSet(mixins.CreateModelMixin,
                          mixins.ListModelMixin,
@@ -226,10 +509,11 @@ class FotoLimpezaViewSet(mixins.CreateModelMixin,
     serializer_class = FotoLimpezaSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
+    max_fotos_por_registro = 3
 
     def get_permissions(self):
         """Define permissões mais granulares por ação."""
-        if self.action == 'create':
+        if self.action in ('create', 'enviar_em_lote'):
             # Apenas zeladores podem criar fotos
             return [IsZeladorUser()]
         # Para outras ações (list, retrieve, destroy), administradores ou o próprio zelador podem
@@ -248,6 +532,44 @@ class FotoLimpezaViewSet(mixins.CreateModelMixin,
         # Zelador comum vê apenas o que é seu
         return FotoLimpeza.objects.filter(registro_limpeza__funcionario_responsavel=user)
 
+    def _validar_registro_para_fotos(self, request, registro_id, quantidade):
+        """
+        Busca o registro de limpeza do usuário e verifica se ele aceita mais
+        `quantidade` fotos.
+
+        Deve ser chamado dentro de `transaction.atomic()`: o registro fica
+        travado (`select_for_update`) até o fim da transação, para que envios
+        simultâneos não ultrapassem o limite de fotos.
+
+        Returns:
+            Uma tupla `(registro, erro)`, em que `erro` é uma `Response` de
+            falha ou `None` quando o registro pode receber as fotos.
+        """
+        try:
+            # O total de fotos vem na mesma consulta do registro, como
+            # subconsulta (sem GROUP BY, que não é aceito com FOR UPDATE).
+            total_fotos = FotoLimpeza.objects.filter(
+                registro_limpeza=OuterRef('pk')
+            ).order_by().values('registro_limpeza').annotate(total=Count('id')).values('total')
+            registro = LimpezaRegistro.objects.select_for_update().annotate(
+                nfotos=Coalesce(Subquery(total_fotos), 0)
+            ).get(pk=registro_id, funcionario_responsavel=request.user)
+        except LimpezaRegistro.DoesNotExist:
+            return None, Response({'detail': 'Registro de limpeza não encontrado ou não pertence a você.'},
+                                  status=status.HTTP_404_NOT_FOUND)
+
+        if registro.data_hora_fim is not None:
+            return None, Response({'detail': 'Esta limpeza já foi concluída e não aceita mais fotos.'},
+                                  status=status.HTTP_400_BAD_REQUEST)
+
+        if registro.nfotos + quantidade > self.max_fotos_por_registro:
+            return None, Response(
+                {'detail': f'Limite de {self.max_fotos_por_registro} fotos por registro de limpeza atingido.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return registro, None
+
     def create(self, request, *args, **kwargs):
         """
         Cria uma nova foto associada a um registro de limpeza em aberto.
@@ -259,29 +581,67 @@ class FotoLimpezaViewSet(mixins.CreateModelMixin,
             return Response({'detail': 'Os campos "registro_limpeza" (ID) e "imagem" são obrigatórios.'},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            registro = LimpezaRegistro.objects.get(pk=registro_id, funcionario_responsavel=request.user)
-        except LimpezaRegistro.DoesNotExist:
-            return Response({'detail': 'Registro de limpeza não encontrado ou não pertence a você.'},
-                            status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            registro, erro = self._validar_registro_para_fotos(request, registro_id, 1)
+            if erro is not None:
+                return erro
+
+            # Prepara os dados para o serializador
+            serializer_data = {
+                'registro_limpeza': registro.id,
+                'imagem': imagem
+            }
+            serializer = self.get_serializer(data=serializer_data)
+            serializer.is_valid(raise_exception=True)
+            # O serializer.save() agora tem todos os dados necessários
+            self.perform_create(serializer)
 
-        if registro.data_hora_fim is not None:
-            return Response({'detail': 'Esta limpeza já foi concluída e não aceita mais fotos.'},
-                            status=status.HTTP_400_BAD_REQUEST)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-        if registro.fotos.count() >= 3:
-            return Response({'detail': 'Limite de 3 fotos por registro de limpeza atingido.'},
-                            status=status.HTTP_400_BAD_REQUEST)
+    @action(detail=False, methods=['post'])
+    def enviar_em_lote(self, request):
+        """
+        Cria várias fotos de uma vez para um registro de limpeza em aberto.
+
+        Recebe o ID do registro em `registro_limpeza` e as imagens no campo
+        `imagens` (repetido). As mesmas regras do envio individual são
+        verificadas uma única vez para o lote, e todas as fotos são gravadas
+        com um único INSERT. A verificação e a inserção rodam na mesma
+        transação, com o registro travado; se a inserção falhar, os arquivos
+        já gravados são removidos.
+        """
+        registro_id = request.data.get('registro_limpeza')
+        imagens = request.FILES.getlist('imagens')
 
-        # Prepara os dados para o serializador
-        serializer_data = {
-            'registro_limpeza': registro.id,
-            'imagem': imagem
-        }
-        serializer = self.get_serializer(data=serializer_data)
-        serializer.is_valid(raise_exception=True)
-        # O serializer.save() agora tem todos os dados necessários
-        self.perform_create(serializer)
+        if not registro_id or not imagens:
+            return Response({'detail': 'Os campos "registro_limpeza" (ID) e "imagens" são obrigatórios.'},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        campo_imagem = FotoLimpezaSerializer().fields['imagem']
+        try:
+            imagens_validadas = [campo_imagem.run_validation(imagem) for imagem in imagens]
+        except serializers.ValidationError as exc:
+            return Response({'imagens': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            registro, erro = self._validar_registro_para_fotos(request, registro_id, len(imagens))
+            if erro is not None:
+                return erro
+
+            fotos = [FotoLimpeza(registro_limpeza=registro, imagem=imagem) for imagem in imagens_validadas]
+            try:
+                # `bulk_create` não chama `save()`, então o processamento da
+                # imagem feito por `FotoLimpeza.save` é aplicado antes da
+                # inserção. Ele já grava os arquivos no storage.
+                for foto in fotos:
+                    foto.processar_imagem()
+                fotos = FotoLimpeza.objects.bulk_create(fotos)
+            except Exception:
+                for foto in fotos:
+                    if foto.imagem and foto.imagem._committed:
+                        foto.imagem.delete(save=False)
+                raise
+
+        serializer = self.get_serializer(fotos, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -3,31 +3,79 @@ Arquivo de configuração central para a suíte de testes da API.
 Define fixtures reutilizáveis para toda a sessão de testes.
 """
 
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 import requests
 import uuid
+from requests.adapters import HTTPAdapter
+from django.test import override_settings
 from dotenv import load_dotenv
+from filelock import FileLock
 from pathlib import Path
-from PIL import Image
 from typing import Dict, Any
 
 
 dotenv_path = Path(__file__).parent / ".env.test"
 load_dotenv(dotenv_path=dotenv_path)
 
+CREDENCIAIS_DE_TESTE = [
+    ("TEST_USER_ADMIN_USERNAME", "TEST_USER_ADMIN_PASSWORD"),
+    ("TEST_USER_ZELADOR_USERNAME", "TEST_USER_ZELADOR_PASSWORD"),
+    ("TEST_USER_SOLICITANTE_USERNAME", "TEST_USER_SOLICITANTE_PASSWORD"),
+    ("TEST_USER_ASSISTENTE_USERNAME", "TEST_USER_ASSISTENTE_PASSWORD"),
+]
+
 
 class TokenManager:
-    """Gerencia e armazena em cache os tokens para a sessão de testes."""
+    """
+    Gerencia e armazena em cache os tokens para a sessão de testes.
+
+    Quando a suíte roda em paralelo (pytest-xdist), os tokens também são
+    gravados em um arquivo compartilhado entre os workers, de modo que
+    cada tipo de usuário faz login apenas uma vez por sessão.
+    """
 
     _tokens = {}
+    _cache_file = None
+
+    @classmethod
+    def configurar_cache_compartilhado(cls, cache_file):
+        """Define o arquivo onde os tokens são compartilhados entre workers."""
+        cls._cache_file = cache_file
 
     @classmethod
-    def get_token(cls, base_url, username_env, password_env):
-        """Obtém um token, fazendo login apenas uma vez por tipo de usuário."""
+    def get_token(cls, base_url, username_env, password_env, http=requests):
+        """
+        Obtém um token, fazendo login apenas uma vez por tipo de usuário.
+
+        `http` é o cliente usado no login; por padrão, o próprio módulo
+        `requests`, mas as fixtures passam a sessão compartilhada.
+        """
         if username_env in cls._tokens:
             return cls._tokens[username_env]
 
+        if cls._cache_file is None:
+            return cls._login(base_url, username_env, password_env, http)
+
+        with FileLock(f"{cls._cache_file}.lock"):
+            tokens = {}
+            if cls._cache_file.exists():
+                tokens = json.loads(cls._cache_file.read_text())
+
+            if username_env in tokens:
+                cls._tokens[username_env] = tokens[username_env]
+                return tokens[username_env]
+
+            token = cls._login(base_url, username_env, password_env, http)
+            tokens[username_env] = token
+            cls._cache_file.write_text(json.dumps(tokens))
+            return token
+
+    @classmethod
+    def _login(cls, base_url, username_env, password_env, http):
+        """Faz o login do usuário e guarda o token no cache do processo."""
         username = os.getenv(username_env)
         password = os.getenv(password_env)
 
@@ -35,7 +83,7 @@ class TokenManager:
             pytest.fail(f"Credenciais para {username_env} não definidas no .env.test")
 
         try:
-            response = requests.post(
+            response = http.post(
                 f"{base_url}/accounts/login/",
                 json={"username": username, "password": password},
             )
@@ -58,6 +106,51 @@ class TokenManager:
             )
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_de_tokens_compartilhado(tmp_path_factory):
+    """
+    Com pytest-xdist, aponta o TokenManager para um arquivo no diretório
+    temporário comum a todos os workers da sessão.
+    """
+    if os.getenv("PYTEST_XDIST_WORKER") is None:
+        yield
+        return
+
+    cache_file = tmp_path_factory.getbasetemp().parent / ".pytest_tokens.json"
+    TokenManager.configurar_cache_compartilhado(cache_file)
+    yield
+    TokenManager.configurar_cache_compartilhado(None)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def media_root_por_worker(tmp_path_factory):
+    """
+    Com pytest-xdist, dá a cada worker seu próprio MEDIA_ROOT, para que os
+    testes que gravam imagens pelo `APIClient` não disputem os mesmos
+    arquivos.
+    """
+    if os.getenv("PYTEST_XDIST_WORKER") is None:
+        yield
+        return
+
+    with override_settings(MEDIA_ROOT=str(tmp_path_factory.mktemp("media"))):
+        yield
+
+
+@pytest.fixture(scope="session")
+def http():
+    """
+    Fornece uma `requests.Session` compartilhada pela sessão de testes,
+    reaproveitando as conexões HTTP (keep-alive) entre as requisições.
+    """
+    sessao = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    sessao.mount("http://", adapter)
+    sessao.mount("https://", adapter)
+    yield sessao
+    sessao.close()
+
+
 @pytest.fixture(scope="session")
 def api_base_url() -> str:
     """Fixture que fornece a URL base da API (com /api) a partir do .env.test."""
@@ -67,44 +160,77 @@ def api_base_url() -> str:
     return f"{url}/api"
 
 
+@pytest.fixture(scope="session", autouse=True)
+def aquecer_tokens(api_base_url, http, cache_de_tokens_compartilhado):
+    """
+    Faz o login de todos os usuários de teste em paralelo no início da
+    sessão, em vez de um login sequencial na primeira vez que cada
+    cabeçalho de autorização é usado.
+    """
+    with ThreadPoolExecutor(max_workers=len(CREDENCIAIS_DE_TESTE)) as executor:
+        list(
+            executor.map(
+                lambda credenciais: TokenManager.get_token(api_base_url, *credenciais, http=http),
+                CREDENCIAIS_DE_TESTE,
+            )
+        )
+
+
 @pytest.fixture(scope="session")
-def auth_header_admin(api_base_url) -> dict:
+def auth_header_admin(api_base_url, http) -> dict:
     """Fornece um cabeçalho de autorização para um usuário Admin."""
     token = TokenManager.get_token(
-        api_base_url, "TEST_USER_ADMIN_USERNAME", "TEST_USER_ADMIN_PASSWORD"
+        api_base_url, "TEST_USER_ADMIN_USERNAME", "TEST_USER_ADMIN_PASSWORD", http=http
     )
     return {"Authorization": f"Token {token}"}
 
 
 @pytest.fixture(scope="session")
-def auth_header_zelador(api_base_url) -> dict:
+def auth_header_zelador(api_base_url, http) -> dict:
     """Fornece um cabeçalho de autorização para um usuário Zelador."""
     token = TokenManager.get_token(
-        api_base_url, "TEST_USER_ZELADOR_USERNAME", "TEST_USER_ZELADOR_PASSWORD"
+        api_base_url, "TEST_USER_ZELADOR_USERNAME", "TEST_USER_ZELADOR_PASSWORD", http=http
     )
     return {"Authorization": f"Token {token}"}
 
 
 @pytest.fixture(scope="session")
-def auth_header_solicitante(api_base_url) -> dict:
+def auth_header_solicitante(api_base_url, http) -> dict:
     """Fornece um cabeçalho de autorização para um usuário Solicitante."""
     token = TokenManager.get_token(
-        api_base_url, "TEST_USER_SOLICITANTE_USERNAME", "TEST_USER_SOLICITANTE_PASSWORD"
+        api_base_url, "TEST_USER_SOLICITANTE_USERNAME", "TEST_USER_SOLICITANTE_PASSWORD", http=http
     )
     return {"Authorization": f"Token {token}"}
 
 
-@pytest.fixture
-def test_image_path(tmp_path):
-    """Cria uma imagem de teste temporária e retorna seu caminho."""
+@pytest.fixture(scope="session")
+def test_image_path(tmp_path_factory):
+    """Cria uma imagem de teste temporária, uma vez por sessão, e retorna seu caminho."""
+    # Importado aqui para que a coleta dos testes não carregue o Pillow.
+    from PIL import Image
+
     image = Image.new("RGB", (10, 10), color="blue")
-    file_path = tmp_path / "test_image.png"
+    file_path = tmp_path_factory.mktemp("img") / "test_image.png"
+    image.save(file_path)
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def second_test_image_path(tmp_path_factory):
+    """
+    Cria, uma vez por sessão, uma segunda imagem de teste, diferente da de
+    `test_image_path`, para os testes que substituem uma imagem por outra.
+    """
+    from PIL import Image
+
+    image = Image.new("RGB", (20, 20), color="red")
+    file_path = tmp_path_factory.mktemp("img") / "nova_imagem.png"
     image.save(file_path)
     return file_path
 
 
 @pytest.fixture
-def sala_de_teste(api_base_url, auth_header_admin):
+def sala_de_teste(api_base_url, http, auth_header_admin):
     """
     Fixture que cria uma sala de teste antes de cada teste que a utiliza
     e a remove ao final, garantindo o isolamento dos testes.
@@ -120,7 +246,7 @@ def sala_de_teste(api_base_url, auth_header_admin):
 
     dados_criacao["nome_numero"] = f"Sala Fixture {uuid.uuid4()}"
 
-    response = requests.post(
+    response = http.post(
         f"{api_base_url}/salas/", headers=auth_header_admin, data=dados_criacao
     )
 
@@ -133,17 +259,17 @@ def sala_de_teste(api_base_url, auth_header_admin):
 
     sala_uuid = sala_criada.get("qr_code_id")
     if sala_uuid:
-        response_delete = requests.delete(
+        response_delete = http.delete(
             f"{api_base_url}/salas/{sala_uuid}/", headers=auth_header_admin
         )
 
 
 @pytest.fixture(scope="session")
-def auth_header_assistente(api_base_url) -> dict:
+def auth_header_assistente(api_base_url, http) -> dict:
     """Fornece um cabeçalho de autorização para um usuário Assistente (Zeladoria)."""
 
     token = TokenManager.get_token(
-        api_base_url, "TEST_USER_ASSISTENTE_USERNAME", "TEST_USER_ASSISTENTE_PASSWORD"
+        api_base_url, "TEST_USER_ASSISTENTE_USERNAME", "TEST_USER_ASSISTENTE_PASSWORD", http=http
     )
     return {"Authorization": f"Token {token}"}
 
@@ -151,6 +277,7 @@ def auth_header_assistente(api_base_url) -> dict:
 @pytest.fixture
 def iniciar_limpeza_para_teste(
     api_base_url: str,
+    http: requests.Session,
     auth_header_zelador: Dict[str, str],
     sala_de_teste: Dict[str, Any],
 ) -> Dict[str, Any]:
@@ -160,7 +287,7 @@ def iniciar_limpeza_para_teste(
     Agora definida em conftest.py para ser acessível globalmente nos testes.
     """
     sala_uuid = sala_de_teste["qr_code_id"]
-    response = requests.post(
+    response = http.post(
         f"{api_base_url}/salas/{sala_uuid}/iniciar_limpeza/",
         headers=auth_header_zelador,
     )
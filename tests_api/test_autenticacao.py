@@ -2,11 +2,9 @@
 
 import os
 import pytest
-import requests
 import uuid
 from io import BytesIO
 from pathlib import Path
-from PIL import Image
 from typing import Dict
 from django.core.files.storage import default_storage
 from django.contrib.auth.models import User, Group
@@ -18,7 +16,8 @@ from accounts.models import Profile
 # Testes de Login (/api/accounts/login/)
 
 
-def test_login_sucesso_admin(api_base_url):
+@pytest.mark.xdist_group("admin_login")
+def test_login_sucesso_admin(api_base_url, http):
     """Verifica se o login com credenciais de Admin é bem-sucedido."""
     admin_username = os.getenv("TEST_USER_ADMIN_USERNAME")
     admin_password = os.getenv("TEST_USER_ADMIN_PASSWORD")
@@ -26,65 +25,66 @@ def test_login_sucesso_admin(api_base_url):
         pytest.fail("Credenciais de Admin não definidas em tests_api/.env.test")
 
     credentials = {"username": admin_username, "password": admin_password}
-    response = requests.post(f"{api_base_url}/accounts/login/", json=credentials)
+    response = http.post(f"{api_base_url}/accounts/login/", json=credentials)
     assert (
         response.status_code == 200
     ), f"Falha no login do Admin. Resposta: {response.text}"
     assert "token" in response.json()
 
 
-def test_login_senha_incorreta(api_base_url):
+def test_login_senha_incorreta(api_base_url, http):
     """Verifica se o login falha com uma senha incorreta."""
     admin_username = os.getenv("TEST_USER_ADMIN_USERNAME")
     if not admin_username:
         pytest.fail("Username do Admin não definido em tests_api/.env.test")
 
     credentials = {"username": admin_username, "password": "senhaerrada"}
-    response = requests.post(f"{api_base_url}/accounts/login/", json=credentials)
+    response = http.post(f"{api_base_url}/accounts/login/", json=credentials)
     assert response.status_code == 400
     assert "non_field_errors" in response.json()
 
 
-def test_login_usuario_inexistente(api_base_url):
+def test_login_usuario_inexistente(api_base_url, http):
     """Verifica se o login falha com um usuário que não existe."""
     credentials = {"username": "usuarioinexistente", "password": "qualquersenha"}
-    response = requests.post(f"{api_base_url}/accounts/login/", json=credentials)
+    response = http.post(f"{api_base_url}/accounts/login/", json=credentials)
     assert response.status_code == 400
 
 
-def test_login_sem_credenciais(api_base_url):
+def test_login_sem_credenciais(api_base_url, http):
     """Verifica se o login falha quando nenhum dado é enviado."""
-    response = requests.post(f"{api_base_url}/accounts/login/", json={})
+    response = http.post(f"{api_base_url}/accounts/login/", json={})
     assert response.status_code == 400
 
 
 # Testes de Acesso a Rotas Protegidas
 
 
-def test_acesso_rota_protegida_sem_token(api_base_url):
+def test_acesso_rota_protegida_sem_token(api_base_url, http):
     """Verifica se o acesso a uma rota protegida é negado sem um token."""
-    response = requests.get(f"{api_base_url}/salas/")
+    response = http.get(f"{api_base_url}/salas/")
     assert response.status_code == 401
 
 
-def test_acesso_rota_protegida_com_token_invalido(api_base_url):
+def test_acesso_rota_protegida_com_token_invalido(api_base_url, http):
     """Verifica se o acesso a uma rota protegida é negado com um token inválido."""
     headers = {"Authorization": "Token tokeninvalido123"}
-    response = requests.get(f"{api_base_url}/salas/", headers=headers)
+    response = http.get(f"{api_base_url}/salas/", headers=headers)
     assert response.status_code == 401
 
 
+@pytest.mark.xdist_group("admin_login")
 @pytest.mark.skip(
     reason="O endpoint de logout precisa ser ajustado no backend para invalidar o token."
 )
-def test_logout_sucesso(api_base_url, auth_header_admin):
+def test_logout_sucesso(api_base_url, http, auth_header_admin):
     """Verifica se o logout é bem-sucedido."""
-    response = requests.post(
+    response = http.post(
         f"{api_base_url}/accounts/logout/", headers=auth_header_admin
     )
     assert response.status_code == 200
 
-    response_depois_logout = requests.get(
+    response_depois_logout = http.get(
         f"{api_base_url}/salas/", headers=auth_header_admin
     )
     assert response_depois_logout.status_code == 401
@@ -112,7 +112,7 @@ solicitante_expected_username = os.getenv(
     ],
 )
 def test_obter_dados_usuario_logado_sucesso(
-    api_base_url, request, auth_fixture, expected_username
+    api_base_url, http, request, auth_fixture, expected_username
 ):
     """
     Verifica se usuários autenticados (Admin, Zelador, Solicitante)
@@ -120,7 +120,7 @@ def test_obter_dados_usuario_logado_sucesso(
     """
     auth_header = request.getfixturevalue(auth_fixture)
 
-    response = requests.get(
+    response = http.get(
         f"{api_base_url}/accounts/current_user/", headers=auth_header
     )
 
@@ -135,12 +135,12 @@ def test_obter_dados_usuario_logado_sucesso(
     assert "profile" in response_data
 
 
-def test_obter_dados_usuario_sem_autenticacao_falha(api_base_url):
+def test_obter_dados_usuario_sem_autenticacao_falha(api_base_url, http):
     """
     Verifica se um usuário não autenticado é proibido (401) de acessar
     o endpoint de usuário atual.
     """
-    response = requests.get(f"{api_base_url}/accounts/current_user/")
+    response = http.get(f"{api_base_url}/accounts/current_user/")
     assert response.status_code == 401
 
 
@@ -491,7 +491,10 @@ def test_patch_profile_apenas_nome_sucesso(
 
 
 def test_patch_profile_apenas_imagem_sucesso(
-    api_client: APIClient, user_com_nome: User, test_image_path: Path, tmp_path
+    api_client: APIClient,
+    user_com_nome: User,
+    test_image_path: Path,
+    second_test_image_path: Path,
 ):
     """Verifica se PATCH /api/accounts/profile/ apenas com 'profile_picture' atualiza a imagem e NÃO afeta o nome."""
     api_client.force_authenticate(user=user_com_nome)
@@ -519,11 +522,7 @@ def test_patch_profile_apenas_imagem_sucesso(
 
     api_client.force_authenticate(user=user_com_nome)
 
-    imagem_nova = Image.new("RGB", (20, 20), color="red")
-    path_imagem_nova = tmp_path / "nova_imagem.png"
-    imagem_nova.save(path_imagem_nova)
-
-    data_patch = {"profile_picture": path_imagem_nova.open("rb")}
+    data_patch = {"profile_picture": second_test_image_path.open("rb")}
 
     response_patch = api_client.patch(url_profile, data_patch, format="multipart")
     data_patch["profile_picture"].close()
@@ -7,6 +7,10 @@ import uuid
 from pathlib import Path
 from typing import Dict, Any
 
+# As suítes do servidor de testes compartilham o mesmo banco; com
+# pytest-xdist, todas rodam em um único worker (ver pytest.ini).
+pytestmark = pytest.mark.xdist_group("servidor_compartilhado")
+
 
 @pytest.fixture
 def setup_fotos_para_listagem(
@@ -405,3 +409,41 @@ def test_criar_foto_permissoes_invalidas_falha(
             f"{api_base_url}/fotos_limpeza/", headers=header, data=payload, files=files
         )
     assert response.status_code == 403
+
+
+# Testes de Envio em Lote (POST /api/fotos_limpeza/enviar_em_lote/)
+
+
+def test_enviar_fotos_em_lote_como_zelador(
+    api_base_url: str,
+    auth_header_zelador: Dict[str, str],
+    test_image_path: Path,
+    iniciar_limpeza_para_teste: Dict[str, Any],
+):
+    """Verifica se o zelador envia várias fotos em uma única requisição e se o limite é respeitado."""
+    registro_id = iniciar_limpeza_para_teste["id"]
+    payload = {"registro_limpeza": str(registro_id)}
+    url = f"{api_base_url}/fotos_limpeza/enviar_em_lote/"
+
+    with open(test_image_path, "rb") as image_file:
+        conteudo = image_file.read()
+
+    files = [
+        ("imagens", (f"foto{i}.png", conteudo, "image/png")) for i in range(2)
+    ]
+    response = requests.post(
+        url, headers=auth_header_zelador, data=payload, files=files
+    )
+    assert response.status_code == 201, response.text
+    fotos = response.json()
+    assert len(fotos) == 2
+    assert all("id" in foto and "imagem" in foto for foto in fotos)
+
+    files = [
+        ("imagens", (f"foto{i}.png", conteudo, "image/png")) for i in range(2)
+    ]
+    response_excedente = requests.post(
+        url, headers=auth_header_zelador, data=payload, files=files
+    )
+    assert response_excedente.status_code == 400
+    assert "Limite de 3 fotos" in response_excedente.json()["detail"]
@@ -1,5 +1,7 @@
 """Testes de integração para o endpoint de Histórico de Limpeza (/api/limpezas/)."""
 
+import csv
+import io
 import os
 import pytest
 import requests
@@ -8,6 +10,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 from pathlib import Path
 
+# As suítes do servidor de testes compartilham o mesmo banco; com
+# pytest-xdist, todas rodam em um único worker (ver pytest.ini).
+pytestmark = pytest.mark.xdist_group("servidor_compartilhado")
+
 
 # Testes de Permissão para Listagem (GET /api/limpezas/)
 
@@ -445,6 +451,131 @@ def test_filtro_data_range_zelador(
     assert registros_filtrados[0]["funcionario_responsavel"] == zelador_logado
 
 
+# Testes de Paginação Opcional (GET /api/limpezas/?page_size=N)
+
+
+def test_listar_historico_paginado_admin(
+    api_base_url: str,
+    auth_header_admin: Dict[str, str],
+    setup_registros_multiplos_zeladores: Dict[str, Any],
+):
+    """Verifica se `page_size` ativa a paginação e se as páginas não se repetem."""
+    response_p1 = requests.get(
+        f"{api_base_url}/limpezas/",
+        headers=auth_header_admin,
+        params={"page_size": 1},
+    )
+    assert response_p1.status_code == 200
+    pagina1 = response_p1.json()
+    assert set(pagina1.keys()) == {"count", "next", "previous", "results"}
+    assert pagina1["count"] >= 2
+    assert len(pagina1["results"]) == 1
+    assert pagina1["previous"] is None
+
+    response_p2 = requests.get(
+        f"{api_base_url}/limpezas/",
+        headers=auth_header_admin,
+        params={"page_size": 1, "page": 2},
+    )
+    assert response_p2.status_code == 200
+    pagina2 = response_p2.json()
+    assert pagina2["count"] == pagina1["count"]
+    assert pagina2["results"][0]["id"] != pagina1["results"][0]["id"]
+
+
+# Testes para o Resumo (GET /api/limpezas/resumo/)
+
+
+def test_resumo_historico_admin_igual_listagem_sem_fotos(
+    api_base_url: str,
+    auth_header_admin: Dict[str, str],
+    setup_registros_multiplos_zeladores: Dict[str, Any],
+):
+    """Verifica se o resumo traz os mesmos dados da listagem completa, sem as fotos."""
+    params = {"sala_uuid": setup_registros_multiplos_zeladores["salas_uuids"][0]}
+
+    response_completa = requests.get(
+        f"{api_base_url}/limpezas/", headers=auth_header_admin, params=params
+    )
+    response_resumo = requests.get(
+        f"{api_base_url}/limpezas/resumo/", headers=auth_header_admin, params=params
+    )
+
+    assert response_completa.status_code == 200
+    assert response_resumo.status_code == 200
+    esperado = [
+        {chave: valor for chave, valor in registro.items() if chave != "fotos"}
+        for registro in response_completa.json()
+    ]
+    assert response_resumo.json() == esperado
+
+
+def test_resumo_historico_zelador_ve_apenas_seus_registros(
+    api_base_url: str,
+    auth_header_zelador: Dict[str, str],
+    setup_registros_multiplos_zeladores: Dict[str, Any],
+):
+    """Verifica se o resumo aplica a mesma regra de visibilidade para o Zelador."""
+    zelador_logado = setup_registros_multiplos_zeladores["zelador1"]
+
+    response = requests.get(
+        f"{api_base_url}/limpezas/resumo/", headers=auth_header_zelador
+    )
+
+    assert response.status_code == 200
+    registros = response.json()
+    assert len(registros) > 0
+    assert all(r["funcionario_responsavel"] == zelador_logado for r in registros)
+
+
+def test_resumo_historico_solicitante_falha(
+    api_base_url: str, auth_header_solicitante: Dict[str, str]
+):
+    """Verifica se um Solicitante é proibido (403 Forbidden) de acessar o resumo."""
+    response = requests.get(
+        f"{api_base_url}/limpezas/resumo/", headers=auth_header_solicitante
+    )
+    assert response.status_code == 403
+
+
+# Testes para a Exportação CSV (GET /api/limpezas/export/)
+
+
+def test_exportar_historico_csv_admin(
+    api_base_url: str,
+    auth_header_admin: Dict[str, str],
+    setup_registros_multiplos_zeladores: Dict[str, Any],
+):
+    """Verifica se a exportação CSV traz as mesmas linhas do resumo filtrado."""
+    params = {"sala_uuid": setup_registros_multiplos_zeladores["salas_uuids"][0]}
+
+    response_csv = requests.get(
+        f"{api_base_url}/limpezas/export/", headers=auth_header_admin, params=params
+    )
+    response_resumo = requests.get(
+        f"{api_base_url}/limpezas/resumo/", headers=auth_header_admin, params=params
+    )
+
+    assert response_csv.status_code == 200
+    assert response_csv.headers["Content-Type"].startswith("text/csv")
+    linhas = list(csv.DictReader(io.StringIO(response_csv.content.decode("utf-8"))))
+    resumo = response_resumo.json()
+    assert len(linhas) == len(resumo) == 1
+    assert linhas[0]["id"] == str(resumo[0]["id"])
+    assert linhas[0]["sala"] == resumo[0]["sala"]
+    assert linhas[0]["funcionario_responsavel"] == resumo[0]["funcionario_responsavel"]
+
+
+def test_exportar_historico_csv_solicitante_falha(
+    api_base_url: str, auth_header_solicitante: Dict[str, str]
+):
+    """Verifica se um Solicitante é proibido (403 Forbidden) de exportar o histórico."""
+    response = requests.get(
+        f"{api_base_url}/limpezas/export/", headers=auth_header_solicitante
+    )
+    assert response.status_code == 403
+
+
 # Testes para Detalhes (GET /api/limpezas/{id}/)
 
 
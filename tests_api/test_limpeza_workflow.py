@@ -7,6 +7,10 @@ import uuid
 from pathlib import Path
 from typing import Dict, Any
 
+# As suítes do servidor de testes compartilham o mesmo banco; com
+# pytest-xdist, todas rodam em um único worker (ver pytest.ini).
+pytestmark = pytest.mark.xdist_group("servidor_compartilhado")
+
 
 # Testes para Iniciar Limpeza
 
@@ -12,6 +12,10 @@ import requests
 from typing import Dict, Any
 from pathlib import Path
 
+# As suítes do servidor de testes compartilham o mesmo banco; com
+# pytest-xdist, todas rodam em um único worker (ver pytest.ini).
+pytestmark = pytest.mark.xdist_group("servidor_compartilhado")
+
 
 # Define um dicionário com um modelo de dados válidos para a criação de uma sala.
 # O nome será modificado em cada teste para garantir a unicidade.
@@ -46,6 +50,45 @@ def test_listar_salas_como_solicitante(api_base_url, auth_header_solicitante):
     assert isinstance(response.json(), list)
 
 
+def test_listar_salas_requisicao_condicional(
+    api_base_url, auth_header_admin, sala_de_teste
+):
+    """Verifica o 304 com o ETag atual e um novo 200 após alterar uma sala."""
+    url = f"{api_base_url}/salas/"
+    response = requests.get(url, headers=auth_header_admin)
+    assert response.status_code == 200
+    etag = response.headers.get("ETag")
+    assert etag
+
+    headers_condicionais = {**auth_header_admin, "If-None-Match": etag}
+    response_304 = requests.get(url, headers=headers_condicionais)
+    assert response_304.status_code == 304
+    assert response_304.content == b""
+
+    response_patch = requests.patch(
+        f"{url}{sala_de_teste['qr_code_id']}/",
+        headers=auth_header_admin,
+        data={"capacidade": 42},
+    )
+    assert response_patch.status_code == 200
+
+    response_atualizada = requests.get(url, headers=headers_condicionais)
+    assert response_atualizada.status_code == 200
+    assert response_atualizada.headers.get("ETag") != etag
+
+
+def test_listar_salas_paginado(api_base_url, auth_header_admin, sala_de_teste):
+    """Verifica se `page_size` ativa a paginação da listagem de salas."""
+    response = requests.get(
+        f"{api_base_url}/salas/", headers=auth_header_admin, params={"page_size": 1}
+    )
+    assert response.status_code == 200
+    pagina = response.json()
+    assert set(pagina.keys()) == {"count", "next", "previous", "results"}
+    assert pagina["count"] >= 1
+    assert len(pagina["results"]) == 1
+
+
 def test_listar_salas_sem_autenticacao(api_base_url):
     """Verifica se o acesso é negado (401) ao listar salas sem autenticação."""
     response = requests.get(f"{api_base_url}/salas/")
@@ -168,6 +211,33 @@ def test_atualizar_parcialmente_sala_outros_usuarios_falha(
     assert response.status_code == 403
 
 
+def test_atualizar_responsaveis_sala_como_admin(
+    api_base_url, auth_header_admin, sala_de_teste
+):
+    """
+    Verifica a validação de `responsaveis` no PATCH: um zelador válido é
+    aceito e um username inexistente faz a requisição inteira falhar (400).
+    """
+    sala_uuid = sala_de_teste["qr_code_id"]
+    zelador = os.getenv("TEST_USER_ZELADOR_USERNAME")
+
+    response = requests.patch(
+        f"{api_base_url}/salas/{sala_uuid}/",
+        headers=auth_header_admin,
+        data={"responsaveis": [zelador]},
+    )
+    assert response.status_code == 200
+    assert response.json()["responsaveis"] == [zelador]
+
+    response = requests.patch(
+        f"{api_base_url}/salas/{sala_uuid}/",
+        headers=auth_header_admin,
+        data={"responsaveis": [zelador, f"inexistente_{uuid.uuid4().hex[:8]}"]},
+    )
+    assert response.status_code == 400
+    assert "responsaveis" in response.json()
+
+
 # Testes de Atualização (PUT /api/salas/{qr_code_id}/)
 
 